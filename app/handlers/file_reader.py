@@ -1,11 +1,65 @@
+import functools
 import vtk
 from utils.config import *
 from objects.nii_object import *
 from handlers.vtk_handler import *
 from vtk.util import numpy_support
-from matplotlib.cm import get_cmap
+from vtk.numpy_interface import dataset_adapter as dsa
 import numpy as np
 
+
+# BRAIN_CMAP is a config constant, so the colormap is sampled once per process.
+# matplotlib is only imported when a colormap is configured.
+if BRAIN_CMAP:
+    from matplotlib.cm import get_cmap
+    _BRAIN_CTABLE = (get_cmap(BRAIN_CMAP)(
+        np.linspace(0, 1, 200, dtype=np.float32))*255).astype(np.uint8)
+else:
+    _BRAIN_CTABLE = None
+
+
+@functools.lru_cache(maxsize=8)
+def _build_bw_lut(scalar_min, scalar_max):
+    """
+    Build the lookup table used to color the brain slices. The table only
+    depends on the volume range, so repeated loads reuse the same table.
+    :return: vtkLookupTable
+    """
+    bw_lut = vtk.vtkLookupTable()
+    bw_lut.SetTableRange(scalar_min, scalar_max)
+
+    if _BRAIN_CTABLE is None:
+        bw_lut.SetSaturationRange(0, 0)
+        bw_lut.SetHueRange(0, 0)
+        bw_lut.SetValueRange(0, 2)
+
+    else:
+        # deep copy: Build() grows the table for the special colors, which would
+        # reallocate a shallow wrap anyway, and each cached LUT needs its own array
+        bw_lut.SetTable(numpy_support.numpy_to_vtk(
+            _BRAIN_CTABLE, deep=True, array_type=vtk.VTK_UNSIGNED_CHAR))
+
+    bw_lut.Build()
+    return bw_lut
+
+
+def _make_slice_actor(brain, prop, display_extent):
+    """
+    Create an image actor showing one plane of the colored brain volume.
+    :param brain: a NiiObject with its image_mapper set
+    :param prop: the vtkImageProperty used by the actor
+    :param display_extent: (x_min, x_max, y_min, y_max, z_min, z_max) of the plane
+    :return: vtkImageActor
+    """
+    actor = vtk.vtkImageActor()
+    actor.SetProperty(prop)
+    actor.GetMapper().SetInputConnection(brain.image_mapper.GetOutputPort())
+    actor.SetDisplayExtent(*display_extent)
+    actor.InterpolateOn()
+    actor.ForceOpaqueOn()
+    return actor
+
+
 class FileReader:
     def __init__(self):
         self._renderer = None
@@ -13,50 +67,50 @@ class FileReader:
     def read_mask(self, file_name, mask_type):
         mask = NiiObject()
         mask.file = file_name
-        mask.reader = read_volume(mask.file)
+        mask.reader = read_nifti(mask.file)
         mask.extent = mask.reader.GetDataExtent()
-        n_labels = int(mask.reader.GetOutput().GetScalarRange()[1])
+        # pull the voxels once so the extractor only runs for labels in the volume
+        voxels = numpy_support.vtk_to_numpy(
+            mask.reader.GetOutput().GetPointData().GetScalars())
+        unique_labels = np.unique(voxels)
+        n_labels = int(unique_labels[-1])
+        present_labels = set(unique_labels.astype(int).tolist())
+        colors = MASK_COLORS[mask_type]
 
         for label_idx in range(n_labels):
+            if label_idx in MASK_SKIP_LABELS:
+                continue
             mask.labels.append(
-                NiiLabel(MASK_COLORS.get(mask_type)[label_idx], MASK_OPACITY, MASK_SMOOTHNESS))
-            mask.labels[label_idx].extractor = create_mask_extractor(mask)
-            add_surface_rendering(mask, label_idx, label_idx + 1)
-            self._renderer.AddActor(mask.labels[label_idx].actor)
-        # remap labels
-        # for item in mask.labels:
-        #     if not item.actor:
-        #         mask.labels.remove(item)
-        del mask.labels[2]
+                NiiLabel(colors[label_idx], MASK_OPACITY, MASK_SMOOTHNESS))
+            if label_idx + 1 not in present_labels:
+                continue
+            # list position differs from label_idx once a label has been skipped
+            list_idx = len(mask.labels) - 1
+            mask.labels[list_idx].extractor = create_mask_extractor(mask)
+            add_surface_rendering(mask, list_idx, label_idx + 1)
         print(len(mask.labels))
 
+        # group the label surfaces so the renderer gets a single prop per mask
+        mask.assembly = vtk.vtkAssembly()
+        for label in mask.labels:
+            if label.actor:
+                mask.assembly.AddPart(label.actor)
+        self._renderer.AddActor(mask.assembly)
+
         return mask
 
     def read_brain(self, file_name):
         brain = NiiObject()
         brain.file = file_name
-        brain.reader = read_volume(brain.file)
+        brain.reader = read_nifti(brain.file)
         brain.labels.append(
             NiiLabel(BRAIN_COLORS[0], BRAIN_OPACITY, BRAIN_SMOOTHNESS))
         brain.labels[0].extractor = create_brain_extractor(brain)
         brain.extent = brain.reader.GetDataExtent()
 
-        scalar_range = brain.reader.GetOutput().GetScalarRange()
-        bw_lut = vtk.vtkLookupTable()
-        bw_lut.SetTableRange(scalar_range)
-        
-        if not BRAIN_CMAP:
-            bw_lut.SetSaturationRange(0, 0)
-            bw_lut.SetHueRange(0, 0)
-            bw_lut.SetValueRange(0, 2)
-
-        else: 
-            cmap = get_cmap(BRAIN_CMAP)
-            ctable = cmap(np.linspace(0, 1, 200))*255
-            ctable = ctable.astype(np.uint8)
-            bw_lut.SetTable(numpy_support.numpy_to_vtk(ctable))
-       
-        bw_lut.Build()
+        voxels = dsa.WrapDataObject(brain.reader.GetOutput()).PointData[0]
+        scalar_range = (float(voxels.min()), float(voxels.max()))
+        bw_lut = _build_bw_lut(*scalar_range)
         view_colors = vtk.vtkImageMapToColors()
         view_colors.SetInputConnection(brain.reader.GetOutputPort())
         view_colors.SetLookupTable(bw_lut)
@@ -70,32 +124,16 @@ class FileReader:
         y = brain.extent[3]
         z = brain.extent[5]
 
-        axial = vtk.vtkImageActor()
-        axial_prop = vtk.vtkImageProperty()
-        axial_prop.SetOpacity(1)
-        axial.SetProperty(axial_prop)
-        axial.GetMapper().SetInputConnection(brain.image_mapper.GetOutputPort())
-        axial.SetDisplayExtent(0, x, 0, y, int(z/2), int(z/2))
-        axial.InterpolateOn()
-        axial.ForceOpaqueOn()
-
-        coronal = vtk.vtkImageActor()
-        cor_prop = vtk.vtkImageProperty()
-        cor_prop.SetOpacity(1)
-        coronal.SetProperty(cor_prop)
-        coronal.GetMapper().SetInputConnection(brain.image_mapper.GetOutputPort())
-        coronal.SetDisplayExtent(0, x, int(y/2), int(y/2), 0, z)
-        coronal.InterpolateOn()
-        coronal.ForceOpaqueOn()
-
-        sagittal = vtk.vtkImageActor()
-        sag_prop = vtk.vtkImageProperty()
-        sag_prop.SetOpacity(1)
-        sagittal.SetProperty(sag_prop)
-        sagittal.GetMapper().SetInputConnection(brain.image_mapper.GetOutputPort())
-        sagittal.SetDisplayExtent(int(x/2), int(x/2), 0, y, 0, z)
-        sagittal.InterpolateOn()
-        sagittal.ForceOpaqueOn()
+        # the three planes render with identical settings, so they share one property
+        slice_prop = vtk.vtkImageProperty()
+        slice_prop.SetOpacity(1)
+
+        axial = _make_slice_actor(
+            brain, slice_prop, (0, x, 0, y, int(z/2), int(z/2)))
+        coronal = _make_slice_actor(
+            brain, slice_prop, (0, x, int(y/2), int(y/2), 0, z))
+        sagittal = _make_slice_actor(
+            brain, slice_prop, (int(x/2), int(x/2), 0, y, 0, z))
 
         self._renderer.AddActor(axial)
         self._renderer.AddActor(coronal)
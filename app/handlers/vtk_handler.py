@@ -1,4 +1,6 @@
 import vtk
+import nibabel as nib
+from vtk.util import numpy_support
 from objects import *
 
 '''
@@ -11,24 +13,66 @@ VTK Pipeline:   reader ->
 '''
 
 
-def read_volume(file_name):
+class NiftiReaderShim:
     """
-    :param file_name: The filename of type 'nii.gz'
-    :return: vtkNIFTIImageReader (https://www.vtk.org/doc/nightly/html/classvtkNIFTIImageReader.html)
+    Holds a nibabel-loaded volume as vtkImageData and exposes the parts of the
+    vtkNIFTIImageReader interface used by the handlers (GetOutput,
+    GetOutputPort, GetDataExtent).
+
+    The vtkImageData wraps the voxel buffer without copying it, so the shim
+    keeps the array alive for as long as the image is used. VTK reads the
+    buffer in native byte order, so big-endian voxels are byte-swapped first.
+    """
+
+    def __init__(self, voxels, spacing):
+        voxels = voxels.astype(voxels.dtype.newbyteorder('='), copy=False)
+        self._voxels = voxels.ravel(order='F')
+        self._image = vtk.vtkImageData()
+        self._image.SetDimensions(*voxels.shape[:3])
+        self._image.SetSpacing(*spacing)
+        self._image.GetPointData().SetScalars(
+            numpy_support.numpy_to_vtk(self._voxels, deep=False))
+        self._producer = vtk.vtkTrivialProducer()
+        self._producer.SetOutput(self._image)
+
+    def GetOutput(self):
+        return self._image
+
+    def GetOutputPort(self):
+        return self._producer.GetOutputPort()
+
+    def GetDataExtent(self):
+        return self._image.GetExtent()
+
+
+def read_nifti(file_name):
+    """
+    Load a volume with nibabel, which reads .nii.gz in a single streaming pass
+    (and through indexed_gzip when it is installed).
+    :param file_name: The filename of type 'nii' or 'nii.gz'
+    :return: NiftiReaderShim, usable wherever the vtkNIFTIImageReader was
     """
-    reader = vtk.vtkNIFTIImageReader()
-    reader.SetFileNameSliceOffset(1)
-    reader.SetDataByteOrderToBigEndian()
-    reader.SetFileName(file_name)
-    reader.Update()
-    return reader
+    img = nib.load(file_name)
+    # raw stored values, like vtkNIFTIImageReader; scl_slope/scl_inter are not applied
+    voxels = img.dataobj.get_unscaled()
+    # exports shaped (X, Y, Z, 1, ...) are still a single volume
+    if voxels.ndim > 3 and all(dim == 1 for dim in voxels.shape[3:]):
+        voxels = voxels.reshape(voxels.shape[:3])
+    if voxels.ndim != 3:
+        raise ValueError(
+            f"Expected a 3D volume in {file_name}, got shape {voxels.shape}")
+    # a left-handed qform (qfac = -1) is stored with the slices reversed;
+    # vtkNIFTIImageReader flips them back, so do the same here
+    if img.header['pixdim'][0] < 0:
+        voxels = voxels[:, :, ::-1]
+    return NiftiReaderShim(voxels, img.header.get_zooms()[:3])
 
 
 def create_brain_extractor(brain):
     """
-    Given the output from brain (vtkNIFTIImageReader) extract it into 3D using
+    Given the output from brain (NiftiReaderShim) extract it into 3D using
     vtkFlyingEdges3D algorithm (https://www.vtk.org/doc/nightly/html/classvtkFlyingEdges3D.html)
-    :param brain: a vtkNIFTIImageReader volume containing the brain
+    :param brain: a NiiObject whose reader is a NiftiReaderShim holding the brain
     :return: the extracted volume from vtkFlyingEdges3D
     """
     brain_extractor = vtk.vtkFlyingEdges3D()
@@ -39,13 +83,14 @@ def create_brain_extractor(brain):
 
 def create_mask_extractor(mask):
     """
-    Given the output from mask (vtkNIFTIImageReader) extract it into 3D using
-    vtkDiscreteMarchingCubes algorithm (https://www.vtk.org/doc/release/5.0/html/a01331.html).
-    This algorithm is specialized for reading segmented volume labels.
-    :param mask: a vtkNIFTIImageReader volume containing the mask
-    :return: the extracted volume from vtkDiscreteMarchingCubes
+    Given the output from mask (NiftiReaderShim) extract it into 3D using
+    vtkDiscreteFlyingEdges3D algorithm (https://www.vtk.org/doc/nightly/html/classvtkDiscreteFlyingEdges3D.html).
+    This algorithm is specialized for reading segmented volume labels, and is a
+    threaded replacement for vtkDiscreteMarchingCubes.
+    :param mask: a NiiObject whose reader is a NiftiReaderShim holding the mask
+    :return: the extracted volume from vtkDiscreteFlyingEdges3D
     """
-    mask_extractor = vtk.vtkDiscreteMarchingCubes()
+    mask_extractor = vtk.vtkDiscreteFlyingEdges3D()
     mask_extractor.SetInputConnection(mask.reader.GetOutputPort())
     return mask_extractor
 
@@ -54,7 +99,7 @@ def create_polygon_reducer(extractor):
     """
     Reduces the number of polygons (triangles) in the volume. This is used to speed up rendering.
     (https://www.vtk.org/doc/nightly/html/classvtkDecimatePro.html)
-    :param extractor: an extractor (vtkPolyDataAlgorithm), will be either vtkFlyingEdges3D or vtkDiscreteMarchingCubes
+    :param extractor: an extractor (vtkPolyDataAlgorithm), will be either vtkFlyingEdges3D or vtkDiscreteFlyingEdges3D
     :return: the decimated volume
     """
     reducer = vtk.vtkDecimatePro()
@@ -124,8 +169,6 @@ def create_table():
 
 
 def add_surface_rendering(nii_object, label_idx, label_value):
-    if label_idx == 2:
-        return
     nii_object.labels[label_idx].extractor.SetValue(0, label_value)
     nii_object.labels[label_idx].extractor.Update()
 
@@ -12,7 +12,6 @@ from handlers.brats_data_reader import *
 sys_dir = './3d-brain-thesis'
 sys.path.append(os.path.dirname(sys_dir))
 print(sys.path)
-from models.segtran_modified.code.networks.segtran3d import Segtran3d, set_segtran3d_config, CONFIG
 from app.utils.config import *
 device = 'cpu'
 
@@ -3,12 +3,11 @@ import torch
 import torch.nn.functional as F
 import os
 import argparse
-import copy
 import nibabel as nib
 import numpy as np
 import math
+import zipfile
 
-from models.segtran_modified.code.networks.segtran3d import Segtran3d, set_segtran3d_config, CONFIG
 from models.gan_based_unet.multiscale_generator import MultiscaleGenerator as UNet
 from app.utils.config import *
 
@@ -19,11 +18,33 @@ def convert_args(args):
         new_args.__dict__[key] = value
     return new_args
 
+
+# Checkpoint args that may differ from the runtime args without affecting the weights.
+_IGNORED_KEYS = frozenset({'maxiter', 'checkpoint_path', 'model_input_size', 't_total', 'num_workers',
+                           'lr_warmup_ratio', 'lr_warmup_steps', 'local_rank', 'distributed', 'world_size',
+                           'seed', 'debug', 'test_ds_name', 'test_ds_name', 'batch_size', 'dropout_prob',
+                           'orig_patch_size', 'input_patch_size', 'D_pool_K', 'binarize',
+                           'checkpoint_dir', 'iters', 'out_origsize', 'out_softscores', 'verbose_output',
+                           'gpu', 'test_interp', 'do_remove_frag', 'reload_mask', 'saveiter',
+                           'job_name', 'ds_names', 'train_ds_names', 'dice_warmup_steps', 'opt', 'lr', 'decay',
+                           'grad_clip', 'localization_prob', 'tune_bn_only', 'MAX_DICE_W', 'deterministic',
+                           'lr_schedule', 'out_fpn_do_dropout', 'randscale', 'do_affine', 'focus_class',
+                           'bce_weight', 'D_scale', 'orig_input_size', 'input_scale',
+                           'mean', 'std', 'mask_thres', 'use_pretrained', 'only_first_linear_in_squeeze',
+                           'perturb_posw_range'})
+
+# Some old models don't have these keys in args. But they use the values specified here.
+_OLD_DEFAULT_KEYS = {'out_fpn_upsampleD_scheme': 'interpolate',
+                     'num_recurrences': 1, 'qk_have_bias': True}
+
+
 def load_segtran_model_state(net, args, checkpoint_path):
+    # mmap keeps the checkpoint on disk until each tensor is bound to the net.
+    # Legacy (pre-zipfile) checkpoints cannot be memory-mapped.
     state_dict = torch.load(
-        checkpoint_path, map_location=torch.device(args.device))
+        checkpoint_path, map_location=torch.device(args.device),
+        mmap=zipfile.is_zipfile(checkpoint_path), weights_only=True)
     state_dict['args']['device'] = args.device
-    params = net.state_dict()
     if 'model' in state_dict:
         model_state_dict = state_dict['model']
         cp_args = state_dict['args']
@@ -33,39 +54,22 @@ def load_segtran_model_state(net, args, checkpoint_path):
         cp_args = None
         cp_iter_num = 0
 
-    ignored_keys = ['maxiter', 'checkpoint_path', 'model_input_size', 't_total', 'num_workers',
-                    'lr_warmup_ratio', 'lr_warmup_steps', 'local_rank', 'distributed', 'world_size',
-                    'seed', 'debug', 'test_ds_name', 'test_ds_name', 'batch_size', 'dropout_prob',
-                    'orig_patch_size', 'input_patch_size', 'D_pool_K', 'binarize',
-                    'checkpoint_dir', 'iters', 'out_origsize', 'out_softscores', 'verbose_output',
-                    'gpu', 'test_interp', 'do_remove_frag', 'reload_mask', 'saveiter',
-                    'job_name', 'ds_names', 'train_ds_names', 'dice_warmup_steps', 'opt', 'lr', 'decay',
-                    'grad_clip', 'localization_prob', 'tune_bn_only', 'MAX_DICE_W', 'deterministic',
-                    'lr_schedule', 'out_fpn_do_dropout', 'randscale', 'do_affine', 'focus_class',
-                    'bce_weight', 'D_scale', 'orig_input_size', 'input_scale',
-                    'mean', 'std', 'mask_thres', 'use_pretrained', 'only_first_linear_in_squeeze',
-                    'perturb_posw_range']
-
-    # Some old models don't have these keys in args. But they use the values specified here.
-    old_default_keys = {'out_fpn_upsampleD_scheme': 'interpolate',
-                        'num_recurrences': 1, 'qk_have_bias': True}
-    args2 = copy.copy(args)
-
     if args.net == 'segtran' and cp_args is not None:
-        for k in old_default_keys:
-            if k not in args:
-                args2.__dict__[k] = old_default_keys[k]
+        for k, v in _OLD_DEFAULT_KEYS.items():
+            args.__dict__.setdefault(k, v)
 
         for k in cp_args:
-            if (k not in ignored_keys) and (args2.__dict__[k] != cp_args[k]):
+            if (k not in _IGNORED_KEYS) and (args.__dict__[k] != cp_args[k]):
                 print("args[{}]={}, checkpoint args[{}]={}, inconsistent!".format(
-                    k, args2.__dict__[k], k, cp_args[k]))
+                    k, args.__dict__[k], k, cp_args[k]))
                 exit(0)
 
-    params.update(model_state_dict)
-    net.load_state_dict(params)
-    del params
-    del args2
+    # Keys absent from the checkpoint keep the net's own tensors.
+    result = net.load_state_dict(model_state_dict, strict=False, assign=True)
+    if result.unexpected_keys:
+        print("checkpoint keys {} not in model, inconsistent!".format(
+            result.unexpected_keys))
+        exit(0)
     del state_dict
     del model_state_dict
 
@@ -109,6 +113,9 @@ def load_segtran_model(cp_dir):
     # checkpoint = torch.load(path, map_loc)
     # checkpoint['args']['device']='cpu'
     # print('CHECKPOINT: \n', checkpoint['args']['device'])
+    # the segtran package is heavy to import and the app ships with the unet model
+    from models.segtran_modified.code.networks.segtran3d import Segtran3d, set_segtran3d_config, CONFIG
+
     args = convert_args(segtran_config)
     print(args)
 
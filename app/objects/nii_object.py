@@ -16,3 +16,4 @@ class NiiObject:
         self.labels = []
         self.image_mapper = None
         self.scalar_range = None
+        self.assembly = None
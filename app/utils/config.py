@@ -14,6 +14,8 @@ MASK_SMOOTHNESS = 500
 MASK_COLORS = {'Ground truth': [(1.00, 0.52, 0.11), (1.00, 0.25, 0.21), (0, 0, 0), (1.00, 0.86, 0.00)],
                'Segmented': [(0,0.78, 0.28), (0.1, 0.45, 0.33), (0,0,0), (0.34, 0.91, 0.78)]}
 
+# mask label indices (label value - 1) that are never rendered; BraTS has no label 3
+MASK_SKIP_LABELS = frozenset({2})
 
 MASK_OPACITY = 1.0
 MODEL_PATH = 'app/model_controller/weights/generator_epoch100_new.pth'
@@ -18,6 +18,17 @@ from receptivefield.types import (
 _logger = get_logger()
 
 
+def _compute_centers(sizes: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """
+    Computes grid centers of feature maps, shifted back by one on even sides.
+
+    :param sizes: int array of shape [num_feature_maps, 2] holding (w, h)
+    :param offsets: int array of shape [num_feature_maps, 2] holding (x, y)
+    :return int array of shape [num_feature_maps, 2] holding (cx, cy)
+    """
+    return sizes // 2 - (1 - (sizes & 1)) + offsets
+
+
 class ReceptiveField(metaclass=ABCMeta):
     def __init__(self, model_func: Callable[[Any], Any]) -> None:
 
@@ -25,17 +36,18 @@ class ReceptiveField(metaclass=ABCMeta):
         self._gradient_function: Callable = None
         self._input_shape: GridShape = None
         self._output_shapes: List[GridShape] = None
+        self._output_sizes: np.ndarray = None
         self._rf_params: List[ReceptiveFieldDescription] = None
+        self._feature_maps_desc: Tuple[FeatureMapDescription, ...] = None
         self._built: bool = False
 
     @property
-    def feature_maps_desc(self) -> List[FeatureMapDescription]:
+    def feature_maps_desc(self) -> Tuple[FeatureMapDescription, ...]:
         """Return description of all feature maps"""
         self._check()
-        return [
-            FeatureMapDescription(size=Size(size.w, size.h), rf=rf)
-            for size, rf in zip(self._output_shapes, self._rf_params)
-        ]
+        if self._feature_maps_desc is None:
+            raise Exception("Receptive field not computed. Run compute function.")
+        return self._feature_maps_desc
 
     @property
     def input_shape(self) -> ImageShape:
@@ -73,6 +85,11 @@ class ReceptiveField(metaclass=ABCMeta):
         self._gradient_function = gradient_function
         self._input_shape = input_shape
         self._output_shapes = output_shapes
+        self._feature_maps_desc = None
+        # [num_feature_maps, 2] array of (w, h), reused by the center lookups
+        self._output_sizes = np.array(
+            [(shape.w, shape.h) for shape in output_shapes], dtype=np.int64
+        )
 
     @abstractmethod
     def _prepare_gradient_func(
@@ -116,36 +133,46 @@ class ReceptiveField(metaclass=ABCMeta):
         """
         pass
 
-    def _get_gradient_activation_at_map_center(
-        self, center_offsets: List[GridPoint], intensity: float = 1
-    ) -> List[np.ndarray]:
-        points = []
-        for fm in range(self.num_feature_maps):
-            output_shape = self._output_shapes[fm]
-            center_offset = center_offsets[fm]
-
-            _logger.debug(
-                f"Computing receptive field for feature map [{fm}] at center "
-                f"({output_shape.w//2}, {output_shape.h//2}) "
-                f"with offset {center_offset}"
-            )
+    def _get_gradient_from_grid_points_batched(
+        self, points_batch: List[List[GridPoint]], intensity: float = 1.0
+    ) -> List[List[np.ndarray]]:
+        """
+        Computes gradients for several point queries at once. Each query is
+        a list of points, one per feature map, as in
+        `_get_gradient_from_grid_points`. The default implementation runs
+        the queries one by one; backends which can stack the perturbations
+        along the batch axis should override it.
+
+        :param points_batch: a list of point queries.
+        :param intensity: scale of the gradient, default = 1
+        :return a list of gradient maps for each feature map, one per query
+        """
+        return [
+            self._get_gradient_from_grid_points(points=points, intensity=intensity)
+            for points in points_batch
+        ]
 
-            # compute grid center
-            w = output_shape.w
-            h = output_shape.h
-            cx = w // 2 - 1 if w % 2 == 0 else w // 2
-            cy = h // 2 - 1 if h % 2 == 0 else h // 2
+    def _get_map_center_points(
+        self, center_offsets: List[GridPoint]
+    ) -> List[GridPoint]:
+        self._check()
+        centers = _compute_centers(
+            self._output_sizes,
+            np.array([(offset.x, offset.y) for offset in center_offsets], dtype=np.int64),
+        )
+
+        _logger.debug(
+            f"Computing receptive field for feature maps at centers "
+            f"{centers.tolist()} with offsets {center_offsets}"
+        )
 
-            cx += center_offset.x
-            cy += center_offset.y
-            points.append(GridPoint(x=cx, y=cy))
-        return self._get_gradient_from_grid_points(points=points, intensity=intensity)
+        return [GridPoint(x=cx, y=cy) for cx, cy in centers.tolist()]
 
     def _check(self):
         if not self._built:
             raise Exception("Receptive field not computed. Run compute function.")
 
-    def compute(self, *args, **kwargs) -> List[FeatureMapDescription]:
+    def compute(self, *args, **kwargs) -> Tuple[FeatureMapDescription, ...]:
         """
         Compute ReceptiveFieldDescription of given model for image of
         shape input_shape [H, W, C]. If receptive field of the network
@@ -161,22 +188,17 @@ class ReceptiveField(metaclass=ABCMeta):
         # define gradient function
         self._build_gradient_func(*args, **kwargs)
 
-        # receptive field at map center
-        rf_grads00 = self._get_gradient_activation_at_map_center(
-            center_offsets=[GridPoint(0, 0)] * self.num_feature_maps
+        # receptive fields at map center, at map center with offset (1, 1)
+        # and at feature map grid start x=0, y=0, backpropagated together
+        rf_grads00, rf_grads11, rf_grads_point00 = self._get_gradient_from_grid_points_batched(
+            points_batch=[
+                self._get_map_center_points([GridPoint(0, 0)] * self.num_feature_maps),
+                self._get_map_center_points([GridPoint(1, 1)] * self.num_feature_maps),
+                [GridPoint(0, 0)] * self.num_feature_maps,
+            ]
         )
         rfs_at00 = estimate_rf_from_gradients(rf_grads00)
-
-        # receptive field at map center with offset (1, 1)
-        rf_grads11 = self._get_gradient_activation_at_map_center(
-            center_offsets=[GridPoint(1, 1)] * self.num_feature_maps
-        )
         rfs_at11 = estimate_rf_from_gradients(rf_grads11)
-
-        # receptive field at feature map grid start x=0, y=0
-        rf_grads_point00 = self._get_gradient_from_grid_points(
-            points=[GridPoint(0, 0)] * self.num_feature_maps
-        )
         rfs_at_point00 = estimate_rf_from_gradients(rf_grads_point00)
 
         self._rf_params = []
@@ -204,6 +226,12 @@ class ReceptiveField(metaclass=ABCMeta):
             )
             self._rf_params.append(rf_params)
 
+        # shapes and rf params are fixed until the next compute, so build the
+        # descriptions once
+        self._feature_maps_desc = tuple(
+            FeatureMapDescription(size=Size(size.w, size.h), rf=rf)
+            for size, rf in zip(self._output_shapes, self._rf_params)
+        )
         return self.feature_maps_desc
 
     def plot_gradients_at(
@@ -225,8 +253,9 @@ class ReceptiveField(metaclass=ABCMeta):
             figure is used.
         """
 
+        num_feature_maps = self.num_feature_maps
         if layout is None:
-            layout = (self.num_feature_maps, 1)
+            layout = (num_feature_maps, 1)
         if figsize is not None:
             plt.figure(figsize=figsize)
 
@@ -234,7 +263,7 @@ class ReceptiveField(metaclass=ABCMeta):
             points=[GridPoint(*point) for point in points]
         )
 
-        for fm in range(self.num_feature_maps):
+        for fm in range(num_feature_maps):
             axis = plt.subplot(layout[0], layout[1], fm + 1)
             plot_gradient_field(
                 receptive_field_grad=receptive_field_grads[fm], image=image, axis=axis
@@ -326,12 +355,13 @@ class ReceptiveField(metaclass=ABCMeta):
             figure is used.
         """
 
+        num_feature_maps = self.num_feature_maps
         if layout is None:
-            layout = (self.num_feature_maps, 1)
+            layout = (num_feature_maps, 1)
         if figsize is not None:
             plt.figure(figsize=figsize)
 
-        for fm in range(self.num_feature_maps):
+        for fm in range(num_feature_maps):
             axis = plt.subplot(layout[0], layout[1], fm + 1)
             self.plot_rf_grid(
                 fm_id=fm,
@@ -204,7 +204,7 @@ class KerasReceptiveField(ReceptiveField):
 
     def compute(
         self, input_shape: ImageShape, input_layer: str, output_layers: List[str]
-    ) -> List[FeatureMapDescription]:
+    ) -> Tuple[FeatureMapDescription, ...]:
 
         """
         Compute ReceptiveFieldDescription of given model for image of
@@ -55,7 +55,9 @@ def _define_receptive_field_func(
 
         grads = []
         for fm_idx, rf_mask in enumerate(receptive_field_masks):
-            input_tensor = torch.randn(*shape).cuda()
+            # one input image per stacked mask, so a batch of queries
+            # shares a single forward and backward pass
+            input_tensor = torch.randn(rf_mask.shape[0], *shape[1:]).cuda()
             input_tensor.requires_grad_(True)
             model.zero_grad()
             _ = model(input_tensor)
@@ -70,6 +72,17 @@ def _define_receptive_field_func(
     return gradient_function, input_shape, output_shapes
 
 
+def _postprocess_grad(grad: np.ndarray, fm_idx: int) -> np.ndarray:
+    # convert to NHWC format
+    grad = np.abs(np.transpose(grad, [0, 2, 3, 1]))
+    with np.errstate(all='raise'):
+        try:
+            normed_grad = grad / grad.max()
+        except FloatingPointError:
+            raise ValueError(f"Zero gradient for feature map [{fm_idx}].")
+    return normed_grad
+
+
 class PytorchReceptiveField(ReceptiveField):
     def __init__(self, model_func: Callable[[], nn.Module]):
         """
@@ -127,20 +140,45 @@ class PytorchReceptiveField(ReceptiveField):
             output_feature_map[:, :, points[fm].y, points[fm].x] = intensity
             output_feature_maps.append(output_feature_map)
 
-        def _postprocess_grad(grad: np.ndarray) -> np.ndarray:
-            # convert to NHWC format
-            grad = np.abs(np.transpose(grad, [0, 2, 3, 1]))
-            with np.errstate(all='raise'):
-                try:
-                    normed_grad = grad / grad.max()
-                except FloatingPointError:
-                    breakpoint()
-            return normed_grad
-
         torch_grads = self._gradient_function(output_feature_maps)
-        return [_postprocess_grad(grad) for grad in torch_grads]
+        return [
+            _postprocess_grad(grad, fm_idx) for fm_idx, grad in enumerate(torch_grads)
+        ]
+
+    def _get_gradient_from_grid_points_batched(
+        self, points_batch: List[List[GridPoint]], intensity: float = 1.0
+    ) -> List[List[np.ndarray]]:
+        """
+        Computes gradients for several point queries with one forward and
+        backward pass per feature map. The perturbations of all queries are
+        stacked along the batch axis.
+
+        :param points_batch: a list of point queries, each holding one
+            source coordinate per feature map.
+        :param intensity: scale of the gradient, default = 1
+        :return a list of gradient maps of shape [1, H, W, C] for each
+            feature map, one per query
+        """
+        num_queries = len(points_batch)
+        output_feature_maps = []
+        for fm in range(self.num_feature_maps):
+            os = self._output_shapes[fm]
+            # input tensors are in NCHW format
+            output_feature_map = torch.zeros(size=[num_queries, 1, os.h, os.w]).cuda()
+            for query, points in enumerate(points_batch):
+                output_feature_map[query, :, points[fm].y, points[fm].x] = intensity
+            output_feature_maps.append(output_feature_map)
 
-    def compute(self, input_shape: ImageShape) -> List[FeatureMapDescription]:
+        torch_grads = self._gradient_function(output_feature_maps)
+        return [
+            [
+                _postprocess_grad(grad[query:query + 1], fm_idx)
+                for fm_idx, grad in enumerate(torch_grads)
+            ]
+            for query in range(num_queries)
+        ]
+
+    def compute(self, input_shape: ImageShape) -> Tuple[FeatureMapDescription, ...]:
         """
         Compute ReceptiveFieldDescription of given model for image of
         shape input_shape [H, W, C]. If receptive field of the network